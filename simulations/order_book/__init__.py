@@ -4,7 +4,8 @@ Order Book Simulation Module
 Implements a limit order book with Price-Visibility-Time priority matching.
 """
 
-from .matching_engine import OrderBook, Order, Side, OrderStatus
+from .matching_engine import OrderBook, AggregatedL2Book, Order, Side, OrderStatus
 from .visualizer import OrderBookVisualizer
 
-__all__ = ['OrderBook', 'Order', 'Side', 'OrderStatus', 'OrderBookVisualizer']
+__all__ = ['OrderBook', 'AggregatedL2Book', 'Order', 'Side', 'OrderStatus',
+           'OrderBookVisualizer']
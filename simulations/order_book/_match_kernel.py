@@ -0,0 +1,74 @@
+"""
+Vectorized matching kernel for a single price level.
+
+The inner matching loop is the hottest code in the engine: a large sweep
+walks many resting orders doing only integer arithmetic. This module
+isolates that arithmetic as a top-level function over a NumPy array of
+remaining quantities so it can be JIT-compiled with Numba. Numba is an
+optional dependency — when it is not installed the kernel falls back to
+a NumPy prefix-sum formulation with identical semantics.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+
+def _match_at_level(remaining: np.ndarray, incoming_quantity: int):
+    """
+    Match an incoming quantity against resting quantities at one price level.
+
+    Args:
+        remaining: int64 array of remaining quantities, in queue order
+        incoming_quantity: Unfilled quantity of the incoming order
+
+    Returns:
+        Tuple of (fills, fully_filled) where fills[i] is the quantity traded
+        against resting order i and fully_filled counts how many resting
+        orders were completely consumed
+    """
+    fills = np.zeros(remaining.shape[0], dtype=np.int64)
+    fully_filled = 0
+    left = incoming_quantity
+    for i in range(remaining.shape[0]):
+        if left <= 0:
+            break
+        quantity = remaining[i]
+        if quantity <= left:
+            fills[i] = quantity
+            left -= quantity
+            fully_filled += 1
+        else:
+            fills[i] = left
+            left = 0
+    return fills, fully_filled
+
+
+def _match_at_level_numpy(remaining: np.ndarray, incoming_quantity: int):
+    """
+    Prefix-sum formulation of _match_at_level, used when Numba is absent.
+
+    The break point of the sweep is located with one cumsum and one
+    searchsorted instead of a Python-level loop: every order whose
+    cumulative quantity fits inside the incoming quantity fills fully, and
+    the next order (if any) takes the remainder.
+    """
+    cumulative = np.cumsum(remaining)
+    fully_filled = int(np.searchsorted(cumulative, incoming_quantity,
+                                       side='right'))
+    fills = np.zeros(remaining.shape[0], dtype=np.int64)
+    fills[:fully_filled] = remaining[:fully_filled]
+    if fully_filled < remaining.shape[0]:
+        consumed = cumulative[fully_filled - 1] if fully_filled else 0
+        fills[fully_filled] = incoming_quantity - consumed
+    return fills, fully_filled
+
+
+if HAVE_NUMBA:
+    match_at_level = njit(cache=True)(_match_at_level)
+else:
+    match_at_level = _match_at_level_numpy
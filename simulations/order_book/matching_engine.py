@@ -13,305 +13,863 @@ Author: SMM282 Quantitative Trading
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from enum import Enum
-from typing import List, Optional, Dict, Tuple
-from collections import defaultdict
+from enum import IntEnum
+from typing import Deque, Iterator, List, Optional, Dict, Sequence, Tuple
+from collections import deque
+from bisect import bisect_left, insort
 import heapq
 
+try:
+    import numpy as np
+    from ._match_kernel import match_at_level
+    _KERNEL_AVAILABLE = True
+except ImportError:
+    _KERNEL_AVAILABLE = False
 
-class Side(Enum):
-    """Order side - Buy or Sell"""
-    BUY = "BUY"
-    SELL = "SELL"
+# Sweeps over at least this many resting orders go through the kernel;
+# below this the NumPy materialization costs more than it saves
+_KERNEL_MIN_ORDERS = 8
 
+# Shared immutable result for submits that produce no trades, so the
+# common no-cross case allocates nothing
+_EMPTY_TRADES: Tuple['Trade', ...] = ()
 
-class OrderStatus(Enum):
+
+class Side(IntEnum):
+    """Order side - Buy or Sell (IntEnum so comparisons are C-level int ops)"""
+    BUY = 0
+    SELL = 1
+
+
+class OrderStatus(IntEnum):
     """Status of an order in the order book"""
-    PENDING = "PENDING"      # Order submitted but not yet processed
-    ACTIVE = "ACTIVE"        # Order is in the book, waiting for match
-    PARTIAL = "PARTIAL"      # Order partially filled
-    FILLED = "FILLED"        # Order completely filled
-    CANCELLED = "CANCELLED"  # Order was cancelled
+    PENDING = 0    # Order submitted but not yet processed
+    ACTIVE = 1     # Order is in the book, waiting for match
+    PARTIAL = 2    # Order partially filled
+    FILLED = 3     # Order completely filled
+    CANCELLED = 4  # Order was cancelled
+
+
+# Statuses in which an order can no longer trade or be cancelled
+_TERMINAL_STATUSES = frozenset({OrderStatus.FILLED, OrderStatus.CANCELLED})
 
 
-@dataclass
 class Order:
     """
     Represents a limit order in the order book.
-    
+
     Attributes:
         order_id: Unique identifier for the order
         side: BUY or SELL
         price: Limit price for the order
         quantity: Number of shares/units
         is_visible: Whether the order is displayed in the order book
-        timestamp: When the order was submitted (auto-generated if not provided)
-        filled_quantity: How much of the order has been filled
+        timestamp: Optional explicit arrival time; set it to replay
+            historical orders out of submission order
+        remaining_quantity: Unfilled quantity, stored directly and updated
+            on fill — the matching loop reads and writes this slot without
+            any property dispatch
         status: Current status of the order
+        seq: Monotonic arrival sequence number assigned by the book at
+            submission — the canonical time-priority tiebreaker
+        price_tick: Integer tick index of price, assigned by the book at
+            submission and used as the internal price key
+        queue_rank: Enqueue index within the order's queue at its price
+            level, maintained by the book for O(1) queue-position queries
+
+    filled_quantity remains available as a derived property.
     """
-    order_id: str
-    side: Side
-    price: float
-    quantity: int
-    is_visible: bool = True
-    timestamp: datetime = field(default_factory=datetime.now)
-    filled_quantity: int = 0
-    status: OrderStatus = OrderStatus.PENDING
-    
+    __slots__ = ('order_id', 'side', 'price', 'quantity', 'is_visible',
+                 'timestamp', 'remaining_quantity', 'status', 'seq',
+                 'price_tick', 'queue_rank')
+
+    def __init__(self, order_id: str, side: Side, price: float, quantity: int,
+                 is_visible: bool = True,
+                 timestamp: Optional[datetime] = None,
+                 filled_quantity: int = 0,
+                 status: OrderStatus = OrderStatus.PENDING,
+                 seq: int = 0, price_tick: int = 0) -> None:
+        self.order_id = order_id
+        self.side = side
+        self.price = price
+        self.quantity = quantity
+        self.is_visible = is_visible
+        self.timestamp = timestamp
+        self.remaining_quantity = quantity - filled_quantity
+        self.status = status
+        self.seq = seq
+        self.price_tick = price_tick
+        self.queue_rank = 0
+
     @property
-    def remaining_quantity(self) -> int:
-        """Returns the unfilled quantity of the order"""
-        return self.quantity - self.filled_quantity
-    
+    def filled_quantity(self) -> int:
+        """How much of the order has been filled"""
+        return self.quantity - self.remaining_quantity
+
+    @filled_quantity.setter
+    def filled_quantity(self, value: int) -> None:
+        self.remaining_quantity = self.quantity - value
+
     def __lt__(self, other: 'Order') -> bool:
         """
-        Comparison for priority queue ordering.
-        Priority: Price > Visibility > Time
-        
-        For BUY orders: Higher price = Higher priority (use negative for min-heap)
+        Price-priority comparison between two orders on the same side.
+
+        For BUY orders: Higher price = Higher priority
         For SELL orders: Lower price = Higher priority
+
+        Visibility and time priority are not compared here: within a price
+        level they are encoded structurally by the PriceLevel queues (visible
+        queue drains before hidden, FIFO within each).
         """
         if self.side == Side.BUY:
-            # For buys: higher price first, then visible first, then earlier time first
-            if self.price != other.price:
-                return self.price > other.price  # Higher price = higher priority
-            if self.is_visible != other.is_visible:
-                return self.is_visible > other.is_visible  # Visible = higher priority
-            return self.timestamp < other.timestamp  # Earlier = higher priority
-        else:
-            # For sells: lower price first, then visible first, then earlier time first
-            if self.price != other.price:
-                return self.price < other.price  # Lower price = higher priority
-            if self.is_visible != other.is_visible:
-                return self.is_visible > other.is_visible  # Visible = higher priority
-            return self.timestamp < other.timestamp  # Earlier = higher priority
-    
+            return self.price > other.price  # Higher price = higher priority
+        return self.price < other.price  # Lower price = higher priority
+
     def __repr__(self) -> str:
         visibility = "V" if self.is_visible else "H"
-        return (f"Order({self.order_id}, {self.side.value}, "
+        return (f"Order({self.order_id}, {self.side.name}, "
                 f"P={self.price:.2f}, Q={self.remaining_quantity}/{self.quantity}, "
-                f"{visibility}, {self.status.value})")
+                f"{visibility}, {self.status.name})")
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """
     Represents an executed trade between two orders.
     
     Attributes:
-        trade_id: Unique identifier for the trade
+        trade_id: Sequential integer identifier for the trade; use
+            trade_id_str for the display form
         buy_order_id: ID of the buy order
         sell_order_id: ID of the sell order
         price: Execution price
         quantity: Number of shares/units traded
         timestamp: When the trade occurred
     """
-    trade_id: str
+    trade_id: int
     buy_order_id: str
     sell_order_id: str
     price: float
     quantity: int
     timestamp: datetime = field(default_factory=datetime.now)
-    
+
+    @property
+    def trade_id_str(self) -> str:
+        """Display form of the trade ID (e.g. 'T000042'), formatted on demand"""
+        return f"T{self.trade_id:06d}"
+
     def __repr__(self) -> str:
-        return (f"Trade({self.trade_id}: {self.buy_order_id} x {self.sell_order_id}, "
+        return (f"Trade({self.trade_id_str}: {self.buy_order_id} x {self.sell_order_id}, "
                 f"P={self.price:.2f}, Q={self.quantity})")
 
 
+class PriceLevel:
+    """
+    Resting orders at a single price, as two FIFO queues.
+
+    Visible orders queue separately from hidden ones, so visibility priority
+    is expressed by draining `visible` before `hidden` — no per-order
+    `is_visible` check is needed on the matching path, and FIFO order within
+    each queue encodes time priority.
+
+    The level also carries running totals of unfilled visible and hidden
+    quantity, maintained on every insert, fill and cancel, so depth queries
+    read one int per level instead of summing over orders.
+
+    Levels are keyed by integer tick internally; the float display price is
+    kept on the level so API boundaries return exactly the price that was
+    submitted, with no tick-to-float rounding.
+
+    Cancelled orders stay in their queue as tombstones (counted in
+    `tombstones`) and are popped lazily when they reach the head; the cached
+    totals never include them, so a level is live exactly while its totals
+    are positive.
+    """
+    __slots__ = ('price', 'visible', 'hidden',
+                 'total_visible_qty', 'total_hidden_qty', 'tombstones',
+                 'visible_popped', 'hidden_popped')
+
+    def __init__(self, price: float) -> None:
+        self.price: float = price
+        self.visible: Deque[Order] = deque()
+        self.hidden: Deque[Order] = deque()
+        self.total_visible_qty: int = 0
+        self.total_hidden_qty: int = 0
+        self.tombstones: int = 0
+        # Count of orders ever popped from each queue; an order's live
+        # position is its queue_rank minus this, so position queries are
+        # O(1) while the level holds no tombstones
+        self.visible_popped: int = 0
+        self.hidden_popped: int = 0
+
+    def __len__(self) -> int:
+        """Number of live (non-tombstoned) orders at this level"""
+        return len(self.visible) + len(self.hidden) - self.tombstones
+
+    def __iter__(self) -> Iterator[Order]:
+        """Live orders in priority order; tombstones are skipped"""
+        for order in self.visible:
+            if order.status != OrderStatus.CANCELLED:
+                yield order
+        for order in self.hidden:
+            if order.status != OrderStatus.CANCELLED:
+                yield order
+
+    def purge_head_tombstones(self) -> None:
+        """Pop cancelled orders from the head of both queues"""
+        queue = self.visible
+        while queue and queue[0].status == OrderStatus.CANCELLED:
+            queue.popleft()
+            self.tombstones -= 1
+            self.visible_popped += 1
+        queue = self.hidden
+        while queue and queue[0].status == OrderStatus.CANCELLED:
+            queue.popleft()
+            self.tombstones -= 1
+            self.hidden_popped += 1
+
+
 class OrderBook:
     """
     Limit Order Book with Price-Visibility-Time Priority Matching.
-    
-    The order book maintains separate lists for buy (bid) and sell (ask) orders,
-    sorted by priority. When a new order arrives, it attempts to match against
-    existing orders on the opposite side.
-    
+
+    The order book keeps each side as price-indexed FIFO levels: a dict maps
+    price tick -> PriceLevel (visible and hidden order queues) and a sorted
+    array of live ticks gives O(1) access to the best level. Inserting into an
+    existing level is O(1) amortized; the tick array is only touched (C-level
+    bisect/memmove over P price levels) when a level is created or drained.
+
     Matching Priority (in order):
     1. Price: More aggressive prices match first
     2. Visibility: Visible orders match before hidden orders
     3. Time: Earlier orders match first (FIFO)
     """
-    
-    def __init__(self):
-        """Initialize an empty order book"""
-        self.bids: List[Order] = []  # Buy orders (sorted by priority)
-        self.asks: List[Order] = []  # Sell orders (sorted by priority)
+
+    def __init__(self, tick_size: float = 0.01):
+        """
+        Initialize an empty order book.
+
+        Args:
+            tick_size: Minimum price increment; prices are stored internally
+                as integer multiples of this tick
+        """
+        self.tick_size: float = tick_size
+        # price tick -> PriceLevel (visible/hidden FIFO queues) at that level.
+        # Integer keys hash and compare in a single op and avoid float-equality
+        # pitfalls (e.g. 99.1 + 0.01 != 99.11).
+        self._bid_levels: Dict[int, PriceLevel] = {}
+        self._ask_levels: Dict[int, PriceLevel] = {}
+        # Live level ticks per side, kept sorted ascending via bisect.insort
+        # (C-level int compares). Best bid is _bid_ticks[-1], best ask is
+        # _ask_ticks[0]; entries are removed exactly when a level drains.
+        self._bid_ticks: List[int] = []
+        self._ask_ticks: List[int] = []
         self.orders: Dict[str, Order] = {}  # All orders by ID
         self.trades: List[Trade] = []  # Executed trades
-        self._trade_counter = 0
-        
-    def _generate_trade_id(self) -> str:
-        """Generate a unique trade ID"""
-        self._trade_counter += 1
-        return f"T{self._trade_counter:06d}"
-    
-    def submit_order(self, order: Order) -> List[Trade]:
+        self._trade_counter: int = 0
+        self._order_seq: int = 0  # Arrival counter for time priority
+        # Free list of retired Order instances reused by new_order
+        self._order_pool: List[Order] = []
+        self._order_pool_cap: int = 100_000
+        # Memoized visible-only best ticks: finding them walks past levels
+        # whose visible queue is empty, so the result is cached per side and
+        # recomputed lazily after the side mutates. The non-visible best is
+        # always an O(1) array-end read and needs no cache.
+        self._vis_best_bid_tick: Optional[int] = None
+        self._vis_best_ask_tick: Optional[int] = None
+        self._vis_bid_dirty: bool = True
+        self._vis_ask_dirty: bool = True
+
+    def _to_tick(self, price: float) -> int:
+        """Convert a float price to its integer tick index"""
+        return int(round(price / self.tick_size))
+
+    @property
+    def bids(self) -> List[Order]:
+        """Buy orders in priority order (best price first)"""
+        return [order
+                for tick in reversed(self._bid_ticks)
+                for order in self._bid_levels[tick]]
+
+    @property
+    def asks(self) -> List[Order]:
+        """Sell orders in priority order (best price first)"""
+        return [order
+                for tick in self._ask_ticks
+                for order in self._ask_levels[tick]]
+
+    def new_order(self, order_id: str, side: Side, price: float,
+                  quantity: int, is_visible: bool = True) -> Order:
+        """
+        Create an order, reusing a recycled instance when one is available.
+
+        Orders returned to the pool via release_order are reset in place
+        (direct slot writes), so replay loops that submit and release
+        millions of orders allocate almost nothing.
+
+        Args:
+            order_id: Unique identifier for the order
+            side: BUY or SELL
+            price: Limit price for the order
+            quantity: Number of shares/units
+            is_visible: Whether the order is displayed in the order book
+
+        Returns:
+            A fresh or recycled Order in PENDING state
+        """
+        pool = self._order_pool
+        if not pool:
+            return Order(order_id, side, price, quantity, is_visible)
+        order = pool.pop()
+        order.order_id = order_id
+        order.side = side
+        order.price = price
+        order.quantity = quantity
+        order.is_visible = is_visible
+        order.timestamp = None
+        order.remaining_quantity = quantity
+        order.status = OrderStatus.PENDING
+        order.seq = 0
+        order.price_tick = 0
+        order.queue_rank = 0
+        return order
+
+    def release_order(self, order_id: str) -> bool:
+        """
+        Retire a terminated (filled or cancelled) order and recycle it.
+
+        Removes the order from the book's ID map and pushes the instance
+        onto the free list for reuse by new_order. Retirement is explicit
+        because the ID map keeps every order reachable for status queries —
+        callers must drop their own references before releasing, as the
+        instance will be reset and reused.
+
+        A cancelled order may still sit in its level's queue as a tombstone
+        awaiting a lazy head pop; it is extracted here before pooling, as a
+        recycled instance must not be reachable from any queue.
+
+        Args:
+            order_id: ID of the order to retire
+
+        Returns:
+            True if the order was retired, False if not found or still live
+        """
+        order = self.orders.get(order_id)
+        if order is None or order.status not in _TERMINAL_STATUSES:
+            return False
+        if order.status == OrderStatus.CANCELLED:
+            self._extract_tombstone(order)
+        del self.orders[order_id]
+        if len(self._order_pool) < self._order_pool_cap:
+            self._order_pool.append(order)
+        return True
+
+    def _extract_tombstone(self, order: Order) -> None:
+        """
+        Remove a cancelled order's tombstone from its level queue, if any.
+
+        Cancellation leaves the order in place for a lazy head pop; when the
+        order is retired early its queue slot must go with it. The O(N)
+        deque removal is fine here — release is off the matching path.
+        """
+        levels = self._bid_levels if order.side == Side.BUY else self._ask_levels
+        level = levels.get(order.price_tick)
+        if level is None:
+            return
+        queue = level.visible if order.is_visible else level.hidden
+        try:
+            pos = queue.index(order)
+        except ValueError:
+            # Already popped by a head purge, or the level at this tick was
+            # drained and recreated without this order
+            return
+        del queue[pos]
+        level.tombstones -= 1
+        # Renumber the tail so queue ranks stay dense, as on mid-queue insert
+        if order.is_visible:
+            popped = level.visible_popped
+        else:
+            popped = level.hidden_popped
+        for i in range(pos, len(queue)):
+            queue[i].queue_rank = popped + i
+
+    def submit_order(self, order: Order) -> Sequence[Trade]:
         """
         Submit a new order to the order book.
-        
+
         The order will first attempt to match against existing orders on the
         opposite side. Any remaining quantity is added to the book.
-        
+
         Args:
             order: The order to submit
-            
+
         Returns:
-            List of trades that resulted from this order
+            Trades that resulted from this order; a shared empty sequence
+            when there were none
         """
         order.status = OrderStatus.ACTIVE
+        order.seq = self._order_seq
+        self._order_seq += 1
+        order.price_tick = self._to_tick(order.price)
         self.orders[order.order_id] = order
-        
-        # Try to match the order
-        trades = self._match_order(order)
-        
-        # If order still has remaining quantity, add to book
-        if order.remaining_quantity > 0:
-            if order.side == Side.BUY:
-                self._insert_sorted(self.bids, order)
+        # Either side can change: the order may consume opposite levels
+        # and/or rest on its own side
+        self._vis_bid_dirty = True
+        self._vis_ask_dirty = True
+
+        # Try to match the order, then book any remaining quantity; the side
+        # is resolved once, and the common case of a passive non-crossing
+        # order skips the matching machinery entirely — just two loads and
+        # one compare against the best opposite tick
+        if order.side == Side.BUY:
+            opposite_ticks = self._ask_ticks
+            if opposite_ticks and order.price_tick >= opposite_ticks[0]:
+                trade = self._fill_top(order, self._ask_levels,
+                                       opposite_ticks, opposite_ticks[0])
+                trades = [trade] if trade is not None \
+                    else self._match_buy(order)
             else:
-                self._insert_sorted(self.asks, order)
-        
-        return trades
-    
-    def _insert_sorted(self, order_list: List[Order], order: Order) -> None:
-        """Insert an order into the sorted list maintaining priority order"""
-        # Use binary search to find insertion point
-        left, right = 0, len(order_list)
-        while left < right:
-            mid = (left + right) // 2
-            if order < order_list[mid]:
-                right = mid
+                trades = _EMPTY_TRADES
+            if order.remaining_quantity > 0:
+                self._enqueue(self._bid_levels, self._bid_ticks, order)
+        else:
+            opposite_ticks = self._bid_ticks
+            if opposite_ticks and order.price_tick <= opposite_ticks[-1]:
+                trade = self._fill_top(order, self._bid_levels,
+                                       opposite_ticks, opposite_ticks[-1])
+                trades = [trade] if trade is not None \
+                    else self._match_sell(order)
             else:
-                left = mid + 1
-        order_list.insert(left, order)
-    
-    def _match_order(self, incoming_order: Order) -> List[Trade]:
+                trades = _EMPTY_TRADES
+            if order.remaining_quantity > 0:
+                self._enqueue(self._ask_levels, self._ask_ticks, order)
+
+        return trades
+
+    def submit_orders(self, orders: List[Order]) -> List[Trade]:
         """
-        Attempt to match an incoming order against the opposite side of the book.
-        
+        Submit a sequence of orders in arrival order.
+
+        Amortizes per-call overhead for replay and backtest workloads: the
+        method and result-list lookups happen once for the whole batch
+        instead of once per order.
+
         Args:
-            incoming_order: The new order to match
-            
+            orders: Orders to submit, in arrival order
+
         Returns:
-            List of trades executed
+            All trades produced by the batch, in execution order
         """
-        trades = []
-        
-        if incoming_order.side == Side.BUY:
-            opposite_side = self.asks
+        trades: List[Trade] = []
+        extend = trades.extend
+        submit = self.submit_order
+        for order in orders:
+            extend(submit(order))
+        return trades
+
+    def _enqueue(self, levels: Dict[int, PriceLevel], ticks: List[int],
+                 order: Order) -> None:
+        """
+        Add a resting order to its price level, creating the level if needed.
+
+        Visible and hidden orders go to separate queues, so visibility
+        priority costs nothing here. The common case is a plain O(1) append:
+        arrival order already encodes time priority. The order only has to be
+        inserted further forward when it outranks the queue tail (a manually
+        backdated timestamp).
+        """
+        level = levels.get(order.price_tick)
+        if level is None:
+            level = PriceLevel(order.price)
+            levels[order.price_tick] = level
+            insort(ticks, order.price_tick)  # C-level int bisect + memmove
+
+        if order.is_visible:
+            queue = level.visible
+            level.total_visible_qty += order.remaining_quantity
+            popped = level.visible_popped
         else:
-            opposite_side = self.bids
-        
-        while incoming_order.remaining_quantity > 0 and opposite_side:
-            best_opposite = opposite_side[0]
-            
-            # Check if prices cross (can trade)
-            if incoming_order.side == Side.BUY:
-                # Buy order matches if its price >= best ask price
-                if incoming_order.price < best_opposite.price:
-                    break  # No match possible
-            else:
-                # Sell order matches if its price <= best bid price
-                if incoming_order.price > best_opposite.price:
-                    break  # No match possible
-            
-            # Execute trade at the resting order's price (price-time priority)
-            trade_price = best_opposite.price
-            trade_quantity = min(incoming_order.remaining_quantity, 
-                                best_opposite.remaining_quantity)
-            
-            # Update quantities
-            incoming_order.filled_quantity += trade_quantity
-            best_opposite.filled_quantity += trade_quantity
-            
-            # Update statuses
-            if incoming_order.remaining_quantity == 0:
-                incoming_order.status = OrderStatus.FILLED
+            queue = level.hidden
+            level.total_hidden_qty += order.remaining_quantity
+            popped = level.hidden_popped
+        pos = len(queue)
+        while pos > 0 and self._arrives_before(order, queue[pos - 1]):
+            pos -= 1
+        if pos == len(queue):
+            order.queue_rank = popped + pos
+            queue.append(order)
+        else:
+            queue.insert(pos, order)
+            # Mid-queue insert (backdated timestamp): renumber the tail so
+            # ranks stay dense — same O(N) as the insert itself
+            for i in range(pos, len(queue)):
+                queue[i].queue_rank = popped + i
+
+    @staticmethod
+    def _arrives_before(order: Order, other: Order) -> bool:
+        """
+        Time priority between two orders in the same queue.
+
+        The integer seq assigned at submission is the canonical tiebreaker —
+        a single int compare instead of a datetime compare. Explicit
+        timestamps (set when replaying historical orders) override it when
+        both orders carry one.
+        """
+        if order.timestamp is not None and other.timestamp is not None:
+            return order.timestamp < other.timestamp
+        return order.seq < other.seq
+
+    @staticmethod
+    def _remove_level(levels: Dict[int, PriceLevel], ticks: List[int],
+                      tick: int) -> None:
+        """Drop a drained price level and its entry in the sorted tick array"""
+        del levels[tick]
+        del ticks[bisect_left(ticks, tick)]
+
+    def _fill_top(self, incoming_order: Order,
+                  opposite_levels: Dict[int, PriceLevel],
+                  opposite_ticks: List[int],
+                  best_tick: int) -> Optional[Trade]:
+        """
+        Fast path for a crossing order fully covered by the top resting order.
+
+        In symmetric flow most crossing orders execute in exactly one fill
+        against the head of the best opposite level; this handles that case
+        as a single sweep step with no matching loop. Returns None without
+        touching anything when more than one resting order is needed, and
+        the general loop takes over.
+        """
+        level = opposite_levels[best_tick]
+        if level.tombstones:
+            level.purge_head_tombstones()
+        head_queue = level.visible if level.visible else level.hidden
+        best_opposite = head_queue[0]
+        trade_quantity = incoming_order.remaining_quantity
+        # Nothing to fill (zero-quantity submit) or the top order cannot
+        # cover the incoming: let the general loop decide, which also
+        # handles both as no-ops correctly
+        if trade_quantity <= 0 \
+                or best_opposite.remaining_quantity < trade_quantity:
+            return None
+
+        trade = self._fill(incoming_order, best_opposite, trade_quantity)
+        if head_queue is level.visible:
+            level.total_visible_qty -= trade_quantity
+        else:
+            level.total_hidden_qty -= trade_quantity
+        if best_opposite.remaining_quantity == 0:
+            head_queue.popleft()
+            if head_queue is level.visible:
+                level.visible_popped += 1
             else:
-                incoming_order.status = OrderStatus.PARTIAL
-                
-            if best_opposite.remaining_quantity == 0:
-                best_opposite.status = OrderStatus.FILLED
-                opposite_side.pop(0)  # Remove filled order from book
+                level.hidden_popped += 1
+            if not len(level):
+                self._remove_level(opposite_levels, opposite_ticks, best_tick)
+        return trade
+
+    def _match_buy(self, incoming_order: Order) -> List[Trade]:
+        """
+        Match an incoming buy order against the ask side.
+
+        Specialized per side so the cross check inside the loop is a single
+        int compare with no side dispatch.
+
+        Args:
+            incoming_order: The new buy order to match
+
+        Returns:
+            List of trades executed
+        """
+        trades: List[Trade] = []
+        levels = self._ask_levels
+        ticks = self._ask_ticks
+        incoming_tick = incoming_order.price_tick
+
+        while incoming_order.remaining_quantity > 0 and ticks:
+            best_tick = ticks[0]
+            # Buy order matches if its price >= best ask price
+            if incoming_tick < best_tick:
+                break
+            self._sweep_level(incoming_order, levels, ticks, best_tick, trades)
+
+        return trades
+
+    def _match_sell(self, incoming_order: Order) -> List[Trade]:
+        """
+        Match an incoming sell order against the bid side.
+
+        Specialized per side so the cross check inside the loop is a single
+        int compare with no side dispatch.
+
+        Args:
+            incoming_order: The new sell order to match
+
+        Returns:
+            List of trades executed
+        """
+        trades: List[Trade] = []
+        levels = self._bid_levels
+        ticks = self._bid_ticks
+        incoming_tick = incoming_order.price_tick
+
+        while incoming_order.remaining_quantity > 0 and ticks:
+            best_tick = ticks[-1]
+            # Sell order matches if its price <= best bid price
+            if incoming_tick > best_tick:
+                break
+            self._sweep_level(incoming_order, levels, ticks, best_tick, trades)
+
+        return trades
+
+    def _sweep_level(self, incoming_order: Order,
+                     opposite_levels: Dict[int, PriceLevel],
+                     opposite_ticks: List[int], best_tick: int,
+                     trades: List[Trade]) -> None:
+        """
+        Fill the incoming order against the head queue of one price level.
+
+        Drains the level's visible queue before its hidden one and removes
+        the level when it empties. Appends resulting trades to `trades`.
+        """
+        level = opposite_levels[best_tick]
+        if level.tombstones:
+            level.purge_head_tombstones()
+        # Visible queue drains before hidden — no per-order visibility check.
+        # A live order exists (levels are removed when their totals drain),
+        # so after the head purge the chosen queue's head is tradeable.
+        head_queue = level.visible if level.visible else level.hidden
+
+        if (_KERNEL_AVAILABLE and level.tombstones == 0
+                and len(head_queue) >= _KERNEL_MIN_ORDERS):
+            # Large sweep: compute all fills at this queue in one kernel
+            # call over the remaining-quantity array, then apply them
+            remaining = np.fromiter(
+                (o.remaining_quantity for o in head_queue),
+                dtype=np.int64, count=len(head_queue))
+            fills, fully_filled = match_at_level(
+                remaining, incoming_order.remaining_quantity)
+            for i in range(fully_filled):
+                trades.append(self._fill(
+                    incoming_order, head_queue.popleft(), int(fills[i])))
+            if fully_filled < len(fills) and fills[fully_filled] > 0:
+                trades.append(self._fill(
+                    incoming_order, head_queue[0], int(fills[fully_filled])))
+            swept = int(fills.sum())
+            if head_queue is level.visible:
+                level.total_visible_qty -= swept
+                level.visible_popped += fully_filled
             else:
-                best_opposite.status = OrderStatus.PARTIAL
-            
-            # Create trade record
-            if incoming_order.side == Side.BUY:
-                buy_id, sell_id = incoming_order.order_id, best_opposite.order_id
+                level.total_hidden_qty -= swept
+                level.hidden_popped += fully_filled
+            if not len(level):
+                self._remove_level(opposite_levels, opposite_ticks, best_tick)
+            return
+
+        best_opposite = head_queue[0]
+        trade_quantity = min(incoming_order.remaining_quantity,
+                             best_opposite.remaining_quantity)
+        trades.append(self._fill(incoming_order, best_opposite, trade_quantity))
+        if head_queue is level.visible:
+            level.total_visible_qty -= trade_quantity
+        else:
+            level.total_hidden_qty -= trade_quantity
+
+        if best_opposite.remaining_quantity == 0:
+            head_queue.popleft()  # Remove filled order from its queue
+            if head_queue is level.visible:
+                level.visible_popped += 1
             else:
-                buy_id, sell_id = best_opposite.order_id, incoming_order.order_id
-                
-            trade = Trade(
-                trade_id=self._generate_trade_id(),
-                buy_order_id=buy_id,
-                sell_order_id=sell_id,
-                price=trade_price,
-                quantity=trade_quantity
-            )
-            trades.append(trade)
-            self.trades.append(trade)
-            
-        return trades
-    
+                level.hidden_popped += 1
+            if not len(level):
+                self._remove_level(opposite_levels, opposite_ticks, best_tick)
+
+    def _fill(self, incoming_order: Order, best_opposite: Order,
+              trade_quantity: int) -> Trade:
+        """
+        Execute a single fill between the incoming order and a resting order.
+
+        Updates quantities and statuses on both orders and records the trade
+        at the resting order's price (price-time priority). Removing a fully
+        filled resting order from its queue is the caller's responsibility.
+        """
+        # Update quantities: direct slot writes, no property dispatch
+        incoming_order.remaining_quantity -= trade_quantity
+        best_opposite.remaining_quantity -= trade_quantity
+
+        # Update statuses
+        if incoming_order.remaining_quantity == 0:
+            incoming_order.status = OrderStatus.FILLED
+        else:
+            incoming_order.status = OrderStatus.PARTIAL
+
+        if best_opposite.remaining_quantity == 0:
+            best_opposite.status = OrderStatus.FILLED
+        else:
+            best_opposite.status = OrderStatus.PARTIAL
+
+        # Create trade record
+        if incoming_order.side == Side.BUY:
+            buy_id, sell_id = incoming_order.order_id, best_opposite.order_id
+        else:
+            buy_id, sell_id = best_opposite.order_id, incoming_order.order_id
+
+        # Plain int counter — no string formatting on the fill path
+        self._trade_counter += 1
+        trade = Trade(
+            trade_id=self._trade_counter,
+            buy_order_id=buy_id,
+            sell_order_id=sell_id,
+            price=best_opposite.price,
+            quantity=trade_quantity
+        )
+        self.trades.append(trade)
+        return trade
+
     def cancel_order(self, order_id: str) -> bool:
         """
         Cancel an order in the order book.
-        
+
         Args:
             order_id: ID of the order to cancel
-            
+
         Returns:
             True if order was cancelled, False if not found or already filled
         """
         if order_id not in self.orders:
             return False
-            
+
         order = self.orders[order_id]
-        
-        if order.status in [OrderStatus.FILLED, OrderStatus.CANCELLED]:
+
+        if order.status in _TERMINAL_STATUSES:
             return False
-        
+
         order.status = OrderStatus.CANCELLED
-        
-        # Remove from appropriate side
+
+        # An order with nothing left resting (e.g. a zero-quantity submit)
+        # was never enqueued — every queued order has positive remaining —
+        # so cancelling it is just the status flip
+        if order.remaining_quantity == 0:
+            return True
+
+        # Tombstone: the order stays in its queue and is popped lazily when
+        # it reaches the head, so cancel never pays an O(N) deque removal.
+        # Only the cached totals and the tombstone count are updated here.
         if order.side == Side.BUY:
-            self.bids = [o for o in self.bids if o.order_id != order_id]
+            levels, ticks = self._bid_levels, self._bid_ticks
+            self._vis_bid_dirty = True
         else:
-            self.asks = [o for o in self.asks if o.order_id != order_id]
-            
+            levels, ticks = self._ask_levels, self._ask_ticks
+            self._vis_ask_dirty = True
+        level = levels.get(order.price_tick)
+        if level is None:  # Defensive: a booked order always has its level
+            return True
+        if order.is_visible:
+            level.total_visible_qty -= order.remaining_quantity
+        else:
+            level.total_hidden_qty -= order.remaining_quantity
+        level.tombstones += 1
+        if level.total_visible_qty == 0 and level.total_hidden_qty == 0:
+            self._remove_level(levels, ticks, order.price_tick)
+
         return True
-    
+
     def get_best_bid(self, visible_only: bool = True) -> Optional[float]:
         """
         Get the best (highest) bid price.
-        
+
         Args:
             visible_only: If True, only consider visible orders (market standard)
-            
+
         Returns:
             Best bid price or None if no bids
         """
-        for order in self.bids:
-            if not visible_only or order.is_visible:
-                return order.price
-        return None
-    
+        tick = self._best_bid_tick(visible_only)
+        return self._bid_levels[tick].price if tick is not None else None
+
+    def _best_bid_tick(self, visible_only: bool) -> Optional[int]:
+        """Tick of the best bid level, or None if no (visible) bids"""
+        if not visible_only:
+            return self._bid_ticks[-1] if self._bid_ticks else None
+        if self._vis_bid_dirty:
+            self._vis_best_bid_tick = None
+            for tick in reversed(self._bid_ticks):
+                if self._bid_levels[tick].total_visible_qty > 0:
+                    self._vis_best_bid_tick = tick
+                    break
+            self._vis_bid_dirty = False
+        return self._vis_best_bid_tick
+
     def get_best_ask(self, visible_only: bool = True) -> Optional[float]:
         """
         Get the best (lowest) ask price.
-        
+
         Args:
             visible_only: If True, only consider visible orders (market standard)
-            
+
         Returns:
             Best ask price or None if no asks
         """
-        for order in self.asks:
-            if not visible_only or order.is_visible:
-                return order.price
-        return None
+        tick = self._best_ask_tick(visible_only)
+        return self._ask_levels[tick].price if tick is not None else None
+
+    def _best_ask_tick(self, visible_only: bool) -> Optional[int]:
+        """Tick of the best ask level, or None if no (visible) asks"""
+        if not visible_only:
+            return self._ask_ticks[0] if self._ask_ticks else None
+        if self._vis_ask_dirty:
+            self._vis_best_ask_tick = None
+            for tick in self._ask_ticks:
+                if self._ask_levels[tick].total_visible_qty > 0:
+                    self._vis_best_ask_tick = tick
+                    break
+            self._vis_ask_dirty = False
+        return self._vis_best_ask_tick
     
+    def snapshot_l1(self, visible_only: bool = True
+                    ) -> Tuple[Optional[float], int, Optional[float], int,
+                               Optional[float], Optional[float]]:
+        """
+        Take a Level-1 snapshot in a single call.
+
+        One best-level lookup per side replaces the four separate scans of
+        calling get_best_bid, get_best_ask, get_spread and get_midpoint
+        back to back; quantities come from the cached level totals.
+
+        Args:
+            visible_only: If True, only consider visible orders
+
+        Returns:
+            Tuple of (best_bid, bid_qty, best_ask, ask_qty, spread, midpoint);
+            prices and derived values are None when that side is empty
+        """
+        bid_tick = self._best_bid_tick(visible_only)
+        ask_tick = self._best_ask_tick(visible_only)
+
+        best_bid = None
+        bid_qty = 0
+        if bid_tick is not None:
+            level = self._bid_levels[bid_tick]
+            best_bid = level.price
+            bid_qty = level.total_visible_qty
+            if not visible_only:
+                bid_qty += level.total_hidden_qty
+
+        best_ask = None
+        ask_qty = 0
+        if ask_tick is not None:
+            level = self._ask_levels[ask_tick]
+            best_ask = level.price
+            ask_qty = level.total_visible_qty
+            if not visible_only:
+                ask_qty += level.total_hidden_qty
+
+        spread = midpoint = None
+        if best_bid is not None and best_ask is not None:
+            spread = best_ask - best_bid
+            midpoint = (best_bid + best_ask) / 2
+
+        return (best_bid, bid_qty, best_ask, ask_qty, spread, midpoint)
+
     def get_spread(self, visible_only: bool = True) -> Optional[float]:
         """
         Get the bid-ask spread.
@@ -322,11 +880,13 @@ class OrderBook:
         Returns:
             Spread (ask - bid) or None if no complete market
         """
-        best_bid = self.get_best_bid(visible_only)
-        best_ask = self.get_best_ask(visible_only)
-        
-        if best_bid is not None and best_ask is not None:
-            return best_ask - best_bid
+        bid_tick = self._best_bid_tick(visible_only)
+        ask_tick = self._best_ask_tick(visible_only)
+
+        if bid_tick is not None and ask_tick is not None:
+            # One subtraction on the cached best levels' display prices
+            return (self._ask_levels[ask_tick].price
+                    - self._bid_levels[bid_tick].price)
         return None
     
     def get_midpoint(self, visible_only: bool = True) -> Optional[float]:
@@ -339,11 +899,13 @@ class OrderBook:
         Returns:
             Midpoint price or None if no complete market
         """
-        best_bid = self.get_best_bid(visible_only)
-        best_ask = self.get_best_ask(visible_only)
-        
-        if best_bid is not None and best_ask is not None:
-            return (best_bid + best_ask) / 2
+        bid_tick = self._best_bid_tick(visible_only)
+        ask_tick = self._best_ask_tick(visible_only)
+
+        if bid_tick is not None and ask_tick is not None:
+            # One addition and halving on the cached best levels' prices
+            return (self._bid_levels[bid_tick].price
+                    + self._ask_levels[ask_tick].price) / 2
         return None
     
     def get_depth(self, side: Side, levels: int = 5, visible_only: bool = False) -> List[Tuple[float, int]]:
@@ -358,19 +920,28 @@ class OrderBook:
         Returns:
             List of (price, total_quantity) tuples
         """
-        orders = self.bids if side == Side.BUY else self.asks
-        
-        depth: Dict[float, int] = defaultdict(int)
-        for order in orders:
-            if not visible_only or order.is_visible:
-                depth[order.price] += order.remaining_quantity
-        
-        # Sort by priority (highest for bids, lowest for asks)
-        sorted_levels = sorted(depth.items(), 
-                              key=lambda x: x[0], 
-                              reverse=(side == Side.BUY))
-        
-        return sorted_levels[:levels]
+        if side == Side.BUY:
+            price_levels = self._bid_levels
+            sorted_ticks = reversed(self._bid_ticks)
+        else:
+            price_levels = self._ask_levels
+            sorted_ticks = iter(self._ask_ticks)
+
+        # Walk levels by priority (highest for bids, lowest for asks);
+        # the tick array is already sorted, so no per-call sort
+        depth: List[Tuple[float, int]] = []
+        for tick in sorted_ticks:
+            level = price_levels[tick]
+            # Cached totals: one int read per level instead of a sum per order
+            total = level.total_visible_qty
+            if not visible_only:
+                total += level.total_hidden_qty
+            if total > 0:
+                depth.append((level.price, total))
+            if len(depth) == levels:
+                break
+
+        return depth
     
     def display(self, levels: int = 5, show_hidden: bool = True) -> str:
         """
@@ -432,23 +1003,164 @@ class OrderBook:
             return None
             
         order = self.orders[order_id]
-        
-        if order.status in [OrderStatus.FILLED, OrderStatus.CANCELLED]:
+
+        if order.status in _TERMINAL_STATUSES:
             return None
-        
-        order_list = self.bids if order.side == Side.BUY else self.asks
-        
-        # Find orders at same price level
-        same_price_orders = [o for o in order_list if o.price == order.price]
-        
-        for i, o in enumerate(same_price_orders):
+
+        # An order with nothing resting (e.g. a zero-quantity submit) was
+        # never enqueued and holds no rank; it has no queue position even
+        # when other orders occupy a level at its tick
+        if order.remaining_quantity == 0:
+            return None
+
+        levels = self._bid_levels if order.side == Side.BUY else self._ask_levels
+        level = levels.get(order.price_tick)
+        if level is None:
+            return None
+
+        # O(1) from the maintained ranks: live position is the enqueue rank
+        # minus how many orders have been popped ahead, and hidden orders
+        # queue behind every visible one
+        if level.tombstones == 0:
+            if order.is_visible:
+                position = order.queue_rank - level.visible_popped + 1
+            else:
+                position = (len(level.visible)
+                            + order.queue_rank - level.hidden_popped + 1)
+            return (position, len(level))
+
+        # Tombstones still in the queues distort ranks; fall back to a scan
+        # of this one level until they purge
+        for i, o in enumerate(level):
             if o.order_id == order_id:
-                return (i + 1, len(same_price_orders))
-        
+                return (i + 1, len(level))
+
+        return None
+
+
+class AggregatedL2Book:
+    """
+    Aggregate-only (Level-2) order book for replay and backtest workloads.
+
+    Stores a single unfilled-quantity int per price level — no Order or
+    Trade objects at all — for workloads driven by aggregated depth updates
+    that never need per-order state. Matching consumes quantity from the
+    best opposite levels under price priority. Per-order concepts
+    (cancellation by ID, queue position, visibility) do not exist at this
+    granularity; use OrderBook when they are needed.
+    """
+
+    def __init__(self, tick_size: float = 0.01):
+        """
+        Initialize an empty aggregated book.
+
+        Args:
+            tick_size: Minimum price increment; prices are stored internally
+                as integer multiples of this tick
+        """
+        self.tick_size: float = tick_size
+        # price tick -> total unfilled quantity at that level
+        self._bid_qty: Dict[int, int] = {}
+        self._ask_qty: Dict[int, int] = {}
+        # Lazily cleaned heaps of level ticks, as in OrderBook
+        self._bid_heap: List[int] = []
+        self._ask_heap: List[int] = []
+
+    def _to_tick(self, price: float) -> int:
+        """Convert a float price to its integer tick index"""
+        return int(round(price / self.tick_size))
+
+    def _to_price(self, tick: int) -> float:
+        """Convert an integer tick index back to a float price"""
+        return round(tick * self.tick_size, 10)
+
+    @staticmethod
+    def _peek_best_tick(qtys: Dict[int, int], heap: List[int],
+                        sign: int) -> Optional[int]:
+        """Best price tick on one side, popping stale heap entries lazily"""
+        while heap:
+            tick = sign * heap[0]
+            if tick in qtys:
+                return tick
+            heapq.heappop(heap)
         return None
 
+    def submit(self, side: Side, price: float,
+               quantity: int) -> List[Tuple[float, int]]:
+        """
+        Submit quantity at a price and match it against the opposite side.
+
+        Args:
+            side: BUY or SELL
+            price: Limit price
+            quantity: Number of shares/units
+
+        Returns:
+            List of (price, quantity) executions, best price first; any
+            unexecuted remainder is added to the book
+        """
+        tick = self._to_tick(price)
+        is_buy = side == Side.BUY
+        if is_buy:
+            own_qty, own_heap, own_sign = self._bid_qty, self._bid_heap, -1
+            opp_qty, opp_heap, opp_sign = self._ask_qty, self._ask_heap, 1
+        else:
+            own_qty, own_heap, own_sign = self._ask_qty, self._ask_heap, 1
+            opp_qty, opp_heap, opp_sign = self._bid_qty, self._bid_heap, -1
+
+        executions: List[Tuple[float, int]] = []
+        remaining = quantity
+        while remaining > 0:
+            best_tick = self._peek_best_tick(opp_qty, opp_heap, opp_sign)
+            if best_tick is None:
+                break
+            if (tick < best_tick) if is_buy else (tick > best_tick):
+                break
+            available = opp_qty[best_tick]
+            traded = available if available < remaining else remaining
+            remaining -= traded
+            executions.append((self._to_price(best_tick), traded))
+            if traded == available:
+                del opp_qty[best_tick]
+            else:
+                opp_qty[best_tick] = available - traded
+
+        if remaining > 0:
+            if tick in own_qty:
+                own_qty[tick] += remaining
+            else:
+                own_qty[tick] = remaining
+                heapq.heappush(own_heap, own_sign * tick)
+
+        return executions
+
+    def get_best_bid(self) -> Optional[float]:
+        """Best (highest) bid price, or None if no bids"""
+        tick = self._peek_best_tick(self._bid_qty, self._bid_heap, -1)
+        return self._to_price(tick) if tick is not None else None
+
+    def get_best_ask(self) -> Optional[float]:
+        """Best (lowest) ask price, or None if no asks"""
+        tick = self._peek_best_tick(self._ask_qty, self._ask_heap, 1)
+        return self._to_price(tick) if tick is not None else None
+
+    def get_depth(self, side: Side, levels: int = 5) -> List[Tuple[float, int]]:
+        """
+        Get aggregated depth, best price first.
+
+        Args:
+            side: BUY or SELL
+            levels: Number of price levels to return
+
+        Returns:
+            List of (price, total_quantity) tuples
+        """
+        qtys = self._bid_qty if side == Side.BUY else self._ask_qty
+        ticks = sorted(qtys, reverse=(side == Side.BUY))[:levels]
+        return [(self._to_price(tick), qtys[tick]) for tick in ticks]
+
 
-def demo():
+def demo() -> None:
     """Demonstrate the order book matching engine"""
     print("=" * 60)
     print("ORDER BOOK MATCHING ENGINE DEMO")
@@ -516,7 +1228,7 @@ def demo():
     print("5. Order statuses after matching:")
     for order_id in ["B2", "B3", "B4"]:
         order = book.orders[order_id]
-        print(f"   {order_id}: {order.status.value}, "
+        print(f"   {order_id}: {order.status.name}, "
               f"Filled={order.filled_quantity}/{order.quantity}")
 
 
@@ -4,9 +4,65 @@ Order Book Visualizer
 Provides text-based and future graphical visualization of the order book state.
 """
 
+from collections import defaultdict
 from typing import Optional
+
+import numpy as np
+
 from .matching_engine import OrderBook, Order, Side, OrderStatus
 
+# Depth bars from 0 to 20 cells, built once at import so rendering a row is
+# a single indexed load instead of a string multiplication
+_MAX_BAR = 20
+_BARS = ["█" * n for n in range(_MAX_BAR + 1)]
+
+# Invariant box-drawing borders and headers, built once at import; a refresh
+# only formats the data rows. Row templates use %-formatting, which is
+# cheaper than f-strings for simple numerics in a tight loop.
+_L1_TOP = "┌─────────────────────────────────────────┐"
+_L1_TITLE = "│           LEVEL 1 MARKET DATA           │"
+_L1_SEP = "├─────────────────────────────────────────┤"
+_L1_EMPTY = "│         No complete market              │"
+_L1_BOTTOM = "└─────────────────────────────────────────┘"
+_L1_BID_ROW = "│  Best Bid:  %8.2f  x  %-8d   │"
+_L1_ASK_ROW = "│  Best Ask:  %8.2f  x  %-8d   │"
+_L1_SPREAD_ROW = "│  Spread:    %8.4f                  │"
+_L1_MID_ROW = "│  Midpoint:  %8.4f                  │"
+
+_L2_TOP = "┌─────────────────────────────────────────────────────────┐"
+_L2_TITLE = "│                  LEVEL 2 MARKET DEPTH                   │"
+_L2_HEAD_SEP = "├───────────────────────┬─────────────────────────────────┤"
+_L2_HEADER = "│    PRICE    │  SIZE   │         VISUAL DEPTH            │"
+_L2_COL_SEP = "├─────────────┼─────────┼─────────────────────────────────┤"
+_L2_ASKS = "│           ASKS (Sell Orders)                            │"
+_L2_SPREAD_SEP = "├─────────────┴─────────┴─────────────────────────────────┤"
+_L2_SPREAD = "│                      ─── SPREAD ───                     │"
+_L2_RESUME_SEP = "├─────────────┬─────────┬─────────────────────────────────┤"
+_L2_BIDS = "│           BIDS (Buy Orders)                             │"
+_L2_BOTTOM = "└─────────────┴─────────┴─────────────────────────────────┘"
+_L2_ROW = "│  %9.2f  │  %5d  │  %-20s       │"
+
+_L3_TOP = "┌───────────────────────────────────────────────────────────────────┐"
+_L3_TITLE = "│                    LEVEL 3 ORDER BOOK                             │"
+_L3_LEGEND = "│  (V = Visible, H = Hidden)                                        │"
+_L3_TOP_SEP = "├───────────────────────────────────────────────────────────────────┤"
+_L3_ASKS = "│  ASKS (Sell Orders) - Priority: Lowest Price First           │"
+_L3_SEP = "├───────────────────────────────────────────────────────────────┤"
+_L3_SPREAD = "│                         ─── SPREAD ───                        │"
+_L3_BIDS = "│  BIDS (Buy Orders) - Priority: Highest Price First            │"
+_L3_BOTTOM = "└───────────────────────────────────────────────────────────────┘"
+_L3_PRICE_ROW = "│  Price: %.2f"
+_L3_ORDER_ROW = "│    [%d] %s: %d units (%s)"
+
+_TH_TOP = "┌─────────────────────────────────────────────────────────┐"
+_TH_TITLE = "│                    TRADE HISTORY                        │"
+_TH_HEAD_SEP = "├─────────┬─────────────────────┬──────────┬───────────────┤"
+_TH_HEADER = "│  Trade  │  Buy x Sell         │  Price   │    Quantity   │"
+_TH_COL_SEP = "├─────────┼─────────────────────┼──────────┼───────────────┤"
+_TH_EMPTY = "│                  No trades yet                          │"
+_TH_BOTTOM = "└─────────┴─────────────────────┴──────────┴───────────────┘"
+_TH_ROW = "│ %7s │ %8s x %-8s │ %8.2f │ %13d │"
+
 
 class OrderBookVisualizer:
     """
@@ -35,36 +91,24 @@ class OrderBookVisualizer:
         Returns:
             String representation of Level 1 data
         """
-        best_bid = self.order_book.get_best_bid(visible_only=True)
-        best_ask = self.order_book.get_best_ask(visible_only=True)
-        spread = self.order_book.get_spread(visible_only=True)
-        midpoint = self.order_book.get_midpoint(visible_only=True)
-        
-        # Get quantities at best prices
-        bid_depth = self.order_book.get_depth(Side.BUY, 1, visible_only=True)
-        ask_depth = self.order_book.get_depth(Side.SELL, 1, visible_only=True)
-        
-        bid_qty = bid_depth[0][1] if bid_depth else 0
-        ask_qty = ask_depth[0][1] if ask_depth else 0
-        
-        lines = [
-            "┌─────────────────────────────────────────┐",
-            "│           LEVEL 1 MARKET DATA           │",
-            "├─────────────────────────────────────────┤",
-        ]
-        
+        # One snapshot call instead of separate best/spread/midpoint/depth scans
+        best_bid, bid_qty, best_ask, ask_qty, spread, midpoint = \
+            self.order_book.snapshot_l1(visible_only=True)
+
+        lines = [_L1_TOP, _L1_TITLE, _L1_SEP]
+
         if best_bid is not None and best_ask is not None:
             lines.extend([
-                f"│  Best Bid:  {best_bid:>8.2f}  x  {bid_qty:<8}   │",
-                f"│  Best Ask:  {best_ask:>8.2f}  x  {ask_qty:<8}   │",
-                "├─────────────────────────────────────────┤",
-                f"│  Spread:    {spread:>8.4f}                  │",
-                f"│  Midpoint:  {midpoint:>8.4f}                  │",
+                _L1_BID_ROW % (best_bid, bid_qty),
+                _L1_ASK_ROW % (best_ask, ask_qty),
+                _L1_SEP,
+                _L1_SPREAD_ROW % spread,
+                _L1_MID_ROW % midpoint,
             ])
         else:
-            lines.append("│         No complete market              │")
-        
-        lines.append("└─────────────────────────────────────────┘")
+            lines.append(_L1_EMPTY)
+
+        lines.append(_L1_BOTTOM)
         
         return "\n".join(lines)
     
@@ -82,37 +126,32 @@ class OrderBookVisualizer:
         ask_depth = self.order_book.get_depth(Side.SELL, levels, visible_only=not show_hidden)
         bid_depth = self.order_book.get_depth(Side.BUY, levels, visible_only=not show_hidden)
         
-        lines = [
-            "┌─────────────────────────────────────────────────────────┐",
-            "│                  LEVEL 2 MARKET DEPTH                   │",
-            "├───────────────────────┬─────────────────────────────────┤",
-            "│    PRICE    │  SIZE   │         VISUAL DEPTH            │",
-            "├─────────────┼─────────┼─────────────────────────────────┤",
-        ]
-        
-        # Calculate max quantity for scaling
-        all_quantities = [q for _, q in ask_depth + bid_depth]
-        max_qty = max(all_quantities) if all_quantities else 1
+        lines = [_L2_TOP, _L2_TITLE, _L2_HEAD_SEP, _L2_HEADER, _L2_COL_SEP]
         
+        # Scale all bar lengths in two vectorized ops instead of per-row division
+        ask_qtys = np.fromiter((q for _, q in ask_depth),
+                               dtype=np.int64, count=len(ask_depth))
+        bid_qtys = np.fromiter((q for _, q in bid_depth),
+                               dtype=np.int64, count=len(bid_depth))
+        max_qty = int(max(ask_qtys.max(initial=0), bid_qtys.max(initial=0))) or 1
+        ask_bars = _MAX_BAR * ask_qtys // max_qty
+        bid_bars = _MAX_BAR * bid_qtys // max_qty
+
         # ASK side (reversed for display)
-        lines.append("│           ASKS (Sell Orders)                            │")
-        for price, qty in reversed(ask_depth):
-            bar_len = int(20 * qty / max_qty)
-            bar = "█" * bar_len
-            lines.append(f"│  {price:>9.2f}  │  {qty:>5}  │  {bar:<20}       │")
-        
-        lines.append("├─────────────┴─────────┴─────────────────────────────────┤")
-        lines.append("│                      ─── SPREAD ───                     │")
-        lines.append("├─────────────┬─────────┬─────────────────────────────────┤")
-        
+        lines.append(_L2_ASKS)
+        for (price, qty), bar_len in zip(reversed(ask_depth), ask_bars[::-1]):
+            lines.append(_L2_ROW % (price, qty, _BARS[bar_len]))
+
+        lines.append(_L2_SPREAD_SEP)
+        lines.append(_L2_SPREAD)
+        lines.append(_L2_RESUME_SEP)
+
         # BID side
-        lines.append("│           BIDS (Buy Orders)                             │")
-        for price, qty in bid_depth:
-            bar_len = int(20 * qty / max_qty)
-            bar = "█" * bar_len
-            lines.append(f"│  {price:>9.2f}  │  {qty:>5}  │  {bar:<20}       │")
-        
-        lines.append("└─────────────┴─────────┴─────────────────────────────────┘")
+        lines.append(_L2_BIDS)
+        for (price, qty), bar_len in zip(bid_depth, bid_bars):
+            lines.append(_L2_ROW % (price, qty, _BARS[bar_len]))
+
+        lines.append(_L2_BOTTOM)
         
         return "\n".join(lines)
     
@@ -127,53 +166,44 @@ class OrderBookVisualizer:
         Returns:
             String representation of Level 3 data
         """
-        lines = [
-            "┌───────────────────────────────────────────────────────────────────┐",
-            "│                    LEVEL 3 ORDER BOOK                             │",
-            "│  (V = Visible, H = Hidden)                                        │",
-            "├───────────────────────────────────────────────────────────────────┤",
-        ]
+        lines = [_L3_TOP, _L3_TITLE, _L3_LEGEND, _L3_TOP_SEP]
         
         # Group orders by price
-        ask_orders = {}
+        ask_orders = defaultdict(list)
         for order in self.order_book.asks[:20]:  # Limit display
-            if order.price not in ask_orders:
-                ask_orders[order.price] = []
             ask_orders[order.price].append(order)
-        
-        bid_orders = {}
+
+        bid_orders = defaultdict(list)
         for order in self.order_book.bids[:20]:
-            if order.price not in bid_orders:
-                bid_orders[order.price] = []
             bid_orders[order.price].append(order)
         
-        lines.append("│  ASKS (Sell Orders) - Priority: Lowest Price First           │")
-        lines.append("├───────────────────────────────────────────────────────────────┤")
-        
+        lines.append(_L3_ASKS)
+        lines.append(_L3_SEP)
+
         sorted_ask_prices = sorted(ask_orders.keys(), reverse=True)[:levels]
         for price in reversed(sorted_ask_prices):
-            lines.append(f"│  Price: {price:.2f}")
+            lines.append(_L3_PRICE_ROW % price)
             for i, order in enumerate(ask_orders[price]):
                 vis = "V" if order.is_visible else "H"
-                priority = i + 1
-                lines.append(f"│    [{priority}] {order.order_id}: {order.remaining_quantity} units ({vis})")
-        
-        lines.append("├───────────────────────────────────────────────────────────────┤")
-        lines.append("│                         ─── SPREAD ───                        │")
-        lines.append("├───────────────────────────────────────────────────────────────┤")
-        
-        lines.append("│  BIDS (Buy Orders) - Priority: Highest Price First            │")
-        lines.append("├───────────────────────────────────────────────────────────────┤")
-        
+                lines.append(_L3_ORDER_ROW %
+                             (i + 1, order.order_id, order.remaining_quantity, vis))
+
+        lines.append(_L3_SEP)
+        lines.append(_L3_SPREAD)
+        lines.append(_L3_SEP)
+
+        lines.append(_L3_BIDS)
+        lines.append(_L3_SEP)
+
         sorted_bid_prices = sorted(bid_orders.keys(), reverse=True)[:levels]
         for price in sorted_bid_prices:
-            lines.append(f"│  Price: {price:.2f}")
+            lines.append(_L3_PRICE_ROW % price)
             for i, order in enumerate(bid_orders[price]):
                 vis = "V" if order.is_visible else "H"
-                priority = i + 1
-                lines.append(f"│    [{priority}] {order.order_id}: {order.remaining_quantity} units ({vis})")
-        
-        lines.append("└───────────────────────────────────────────────────────────────┘")
+                lines.append(_L3_ORDER_ROW %
+                             (i + 1, order.order_id, order.remaining_quantity, vis))
+
+        lines.append(_L3_BOTTOM)
         
         return "\n".join(lines)
     
@@ -189,24 +219,17 @@ class OrderBookVisualizer:
         """
         trades = self.order_book.trades[-last_n:]
         
-        lines = [
-            "┌─────────────────────────────────────────────────────────┐",
-            "│                    TRADE HISTORY                        │",
-            "├─────────┬─────────────────────┬──────────┬───────────────┤",
-            "│  Trade  │  Buy x Sell         │  Price   │    Quantity   │",
-            "├─────────┼─────────────────────┼──────────┼───────────────┤",
-        ]
-        
+        lines = [_TH_TOP, _TH_TITLE, _TH_HEAD_SEP, _TH_HEADER, _TH_COL_SEP]
+
         for trade in reversed(trades):
-            lines.append(
-                f"│ {trade.trade_id:>7} │ {trade.buy_order_id:>8} x {trade.sell_order_id:<8} │ "
-                f"{trade.price:>8.2f} │ {trade.quantity:>13} │"
-            )
-        
+            lines.append(_TH_ROW % (trade.trade_id_str, trade.buy_order_id,
+                                    trade.sell_order_id, trade.price,
+                                    trade.quantity))
+
         if not trades:
-            lines.append("│                  No trades yet                          │")
-        
-        lines.append("└─────────┴─────────────────────┴──────────┴───────────────┘")
+            lines.append(_TH_EMPTY)
+
+        lines.append(_TH_BOTTOM)
         
         return "\n".join(lines)
     
@@ -8,7 +8,7 @@ import pytest
 from datetime import datetime, timedelta
 
 from simulations.order_book.matching_engine import (
-    OrderBook, Order, Side, OrderStatus, Trade
+    OrderBook, AggregatedL2Book, Order, Side, OrderStatus, Trade
 )
 
 
@@ -263,6 +263,29 @@ class TestOrderCancellation:
         result = book.cancel_order("DOES_NOT_EXIST")
         assert result == False
 
+    def test_queue_position_of_unbooked_order(self):
+        """An order that never rested has no queue position"""
+        book = OrderBook()
+
+        book.submit_order(Order("B1", Side.BUY, 100.00, 50))
+        book.submit_order(Order("B2", Side.BUY, 100.00, 50))
+        book.submit_order(Order("Z", Side.BUY, 100.00, 0))  # Never enqueued
+
+        assert book.get_order_queue_position("Z") is None
+        assert book.get_order_queue_position("B1") == (1, 2)
+        assert book.get_order_queue_position("B2") == (2, 2)
+
+    def test_cancel_unbooked_order(self):
+        """Cancelling an order that never rested should not throw"""
+        book = OrderBook()
+
+        book.submit_order(Order("B1", Side.BUY, 100.00, 100))
+        book.submit_order(Order("B2", Side.BUY, 100.00, 0))  # Never enqueued
+
+        assert book.cancel_order("B2") == True
+        assert book.orders["B2"].status == OrderStatus.CANCELLED
+        assert book.get_best_bid() == 100.00  # B1 untouched
+
 
 class TestPartialFills:
     """Test partial fill scenarios"""
@@ -302,6 +325,47 @@ class TestPartialFills:
         assert book.orders["B2"].status == OrderStatus.PARTIAL
 
 
+class TestLargeSweep:
+    """Test sweeps over many resting orders (exercises the matching kernel)"""
+
+    def test_sweep_many_resting_orders(self):
+        """A large incoming order should fill a deep queue in FIFO order"""
+        book = OrderBook()
+
+        for i in range(12):
+            book.submit_order(Order(f"B{i}", Side.BUY, 100.00, 10))
+
+        # Fills the first 10 orders fully and half of the 11th
+        trades = book.submit_order(Order("S1", Side.SELL, 100.00, 105))
+
+        assert len(trades) == 11
+        assert [t.buy_order_id for t in trades[:10]] == [f"B{i}" for i in range(10)]
+        assert trades[10].buy_order_id == "B10"
+        assert trades[10].quantity == 5
+
+        assert book.orders["B9"].status == OrderStatus.FILLED
+        assert book.orders["B10"].status == OrderStatus.PARTIAL
+        assert book.orders["B10"].remaining_quantity == 5
+        assert book.orders["B11"].remaining_quantity == 10
+
+    def test_sweep_across_price_levels(self):
+        """A sweep should walk price levels in priority order"""
+        book = OrderBook()
+
+        for i in range(8):
+            book.submit_order(Order(f"A{i}", Side.SELL, 100.00, 10))
+        for i in range(8):
+            book.submit_order(Order(f"C{i}", Side.SELL, 100.50, 10))
+
+        trades = book.submit_order(Order("B1", Side.BUY, 101.00, 120))
+
+        assert len(trades) == 12
+        assert all(t.price == 100.00 for t in trades[:8])
+        assert all(t.price == 100.50 for t in trades[8:])
+        assert book.orders["B1"].status == OrderStatus.FILLED
+        assert book.get_best_ask() == 100.50
+
+
 class TestQueuePosition:
     """Test queue position functionality"""
     
@@ -322,5 +386,157 @@ class TestQueuePosition:
         assert pos3 == (3, 3)  # Third of 3 (hidden goes last)
 
 
+class TestBatchSubmit:
+    """Test the batch submission API"""
+
+    def test_submit_orders_matches_in_arrival_order(self):
+        """A batch should behave exactly like sequential submit_order calls"""
+        book = OrderBook()
+
+        trades = book.submit_orders([
+            Order("B1", Side.BUY, 100.00, 50),
+            Order("B2", Side.BUY, 100.00, 50),
+            Order("S1", Side.SELL, 100.00, 75),
+        ])
+
+        assert len(trades) == 2
+        assert trades[0].buy_order_id == "B1"
+        assert trades[1].buy_order_id == "B2"
+        assert book.orders["B2"].status == OrderStatus.PARTIAL
+
+
+class TestOrderPool:
+    """Test order recycling via new_order / release_order"""
+
+    def test_release_and_reuse(self):
+        """Released orders should be reset and reused by new_order"""
+        book = OrderBook()
+
+        first = book.new_order("B1", Side.BUY, 100.00, 50)
+        book.submit_order(first)
+        book.submit_order(book.new_order("S1", Side.SELL, 100.00, 50))
+
+        assert first.status == OrderStatus.FILLED
+        assert book.release_order("B1") == True
+        assert "B1" not in book.orders
+
+        recycled = book.new_order("B2", Side.BUY, 99.00, 10)
+        assert recycled is first  # Same instance, reset in place
+        assert recycled.status == OrderStatus.PENDING
+        assert recycled.filled_quantity == 0
+
+    def test_release_active_order_refused(self):
+        """Live orders must not be recycled"""
+        book = OrderBook()
+        book.submit_order(book.new_order("B1", Side.BUY, 100.00, 50))
+
+        assert book.release_order("B1") == False
+        assert "B1" in book.orders
+
+    def test_released_tombstone_leaves_queue(self):
+        """Recycling a cancelled order must not leave it in a level queue"""
+        book = OrderBook()
+
+        first = book.new_order("B1", Side.BUY, 100.00, 100)
+        book.submit_order(first)
+        book.submit_order(book.new_order("B2", Side.BUY, 100.00, 100))
+        book.cancel_order("B1")
+
+        assert book.release_order("B1") == True
+
+        # The recycled instance rests at a different price; the old queue
+        # slot at 100.00 must be gone, not treated as live again
+        recycled = book.new_order("X1", Side.BUY, 99.00, 100)
+        assert recycled is first
+        book.submit_order(recycled)
+
+        trades = book.submit_order(book.new_order("S1", Side.SELL, 100.00, 100))
+
+        assert len(trades) == 1
+        assert trades[0].buy_order_id == "B2"
+        assert trades[0].price == 100.00
+        assert book.orders["X1"].status == OrderStatus.ACTIVE
+        assert book.get_best_bid() == 99.00
+
+
+class TestZeroQuantity:
+    """Test that zero-quantity submits never trade"""
+
+    def test_zero_quantity_crossing_order_is_noop(self):
+        """A crossing order with no quantity should produce no trades"""
+        book = OrderBook()
+
+        book.submit_order(Order("B1", Side.BUY, 100.00, 100))
+        trades = book.submit_order(Order("S1", Side.SELL, 100.00, 0))
+
+        assert len(trades) == 0
+        assert len(book.trades) == 0
+        assert book.orders["B1"].status == OrderStatus.ACTIVE
+        assert book.orders["B1"].remaining_quantity == 100
+
+
+class TestTombstoneCancel:
+    """Test that lazily-removed cancelled orders never trade"""
+
+    def test_cancelled_mid_queue_order_is_skipped(self):
+        """Matching should fill around an order cancelled mid-queue"""
+        book = OrderBook()
+
+        book.submit_order(Order("B1", Side.BUY, 100.00, 100))
+        book.submit_order(Order("B2", Side.BUY, 100.00, 100))
+        book.submit_order(Order("B3", Side.BUY, 100.00, 100))
+        book.cancel_order("B2")
+
+        trades = book.submit_order(Order("S1", Side.SELL, 100.00, 150))
+
+        assert len(trades) == 2
+        assert trades[0].buy_order_id == "B1"
+        assert trades[1].buy_order_id == "B3"
+        assert book.orders["B2"].status == OrderStatus.CANCELLED
+        assert book.orders["B2"].remaining_quantity == 100
+
+    def test_queue_position_excludes_cancelled(self):
+        """Cancelled orders should not count toward queue position"""
+        book = OrderBook()
+
+        book.submit_order(Order("B1", Side.BUY, 100.00, 100))
+        book.submit_order(Order("B2", Side.BUY, 100.00, 100))
+        book.submit_order(Order("B3", Side.BUY, 100.00, 100))
+        book.cancel_order("B1")
+
+        assert book.get_order_queue_position("B2") == (1, 2)
+        assert book.get_order_queue_position("B3") == (2, 2)
+
+
+class TestAggregatedL2Book:
+    """Test the aggregate-only Level-2 book"""
+
+    def test_submit_and_depth(self):
+        """Quantity should aggregate per price level"""
+        book = AggregatedL2Book()
+
+        book.submit(Side.BUY, 99.50, 100)
+        book.submit(Side.BUY, 99.50, 50)
+        book.submit(Side.BUY, 99.00, 200)
+        book.submit(Side.SELL, 100.00, 75)
+
+        assert book.get_best_bid() == 99.50
+        assert book.get_best_ask() == 100.00
+        assert book.get_depth(Side.BUY) == [(99.50, 150), (99.00, 200)]
+
+    def test_matching_consumes_best_levels(self):
+        """Incoming quantity should execute against best prices first"""
+        book = AggregatedL2Book()
+
+        book.submit(Side.SELL, 100.00, 50)
+        book.submit(Side.SELL, 100.50, 50)
+
+        executions = book.submit(Side.BUY, 100.50, 80)
+
+        assert executions == [(100.00, 50), (100.50, 30)]
+        assert book.get_best_ask() == 100.50
+        assert book.get_depth(Side.SELL) == [(100.50, 20)]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])